@@ -1,9 +1,11 @@
 import os
+import time
 import shutil
 import psutil
 import subprocess
 import winreg
 import logging
+from WinDiagDiskIO import DiskIOSampler
 
 # Configure logging
 logging.basicConfig(filename='system_diagnosis.log', level=logging.INFO, 
@@ -38,6 +40,15 @@ def check_disk_space():
     logging.info(f"Disk Information: {disk_info}")
     return disk_info
 
+def check_disk_io(interval=1):
+    sampler = DiskIOSampler()
+    sampler.sample()
+    time.sleep(interval)
+    disk_io, top_io_processes = sampler.sample()
+    logging.info(f"Disk I/O: {disk_io}")
+    logging.info(f"Top I/O processes: {top_io_processes}")
+    return disk_io, top_io_processes
+
 def find_temp_files():
     temp_dirs = [
         os.environ.get('TEMP', ''),
@@ -203,6 +214,15 @@ def main():
     for device, stats in disk_info.items():
         print(f"{device}: {stats['free']} GB free out of {stats['total']} GB ({stats['percent']}% used)")
     
+    print("\nDisk I/O activity:")
+    disk_io, top_io_processes = check_disk_io()
+    for disk, stats in disk_io.items():
+        print(f"{disk}: {stats['iops']} IOPS, {stats['read_mb_s']} MB/s read, {stats['write_mb_s']} MB/s write, "
+              f"{stats['latency_ms']} ms latency, {stats['busy_percent']}% busy")
+    for proc in top_io_processes:
+        print(f"PID: {proc['pid']}, Name: {proc['name']}, "
+              f"Read: {proc['read_mb_s']} MB/s, Write: {proc['write_mb_s']} MB/s")
+
     print("\nListing top resource-consuming processes:")
     top_processes = list_top_processes()
     for proc in top_processes:
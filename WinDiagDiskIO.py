@@ -0,0 +1,134 @@
+import time
+import heapq
+import psutil
+
+
+class DiskIOSampler:
+    """Compute per-disk I/O pressure and the top I/O processes from successive counter samples.
+
+    The first call to sample() only records a baseline; disk rates are reported from the second
+    call onwards, over the time elapsed since the previous call.
+
+    With `batch_size` set, each call refreshes at most that many processes, walking the process
+    list round-robin and keeping the last computed rate for the others, plus the current top
+    processes, so the cost of a sample does not grow with the number of running processes.
+    Without it every process is refreshed on every call.
+    """
+
+    def __init__(self, top_count=5, batch_size=None):
+        self.top_count = top_count
+        self.batch_size = batch_size
+        self.last_time = None
+        self.disk_state = {}  # disk -> [reads, writes, read_bytes, write_bytes, read_time, write_time, busy_time]
+        self.process_state = {}  # pid -> [create_time, name, read_bytes, write_bytes, sample_time, read_rate, write_rate]
+        self.pids = []  # Process IDs in round-robin order
+        self.cursor = 0
+        self.top_pids = []
+        self.process_io_supported = hasattr(psutil.Process, "io_counters")
+
+    def sample(self):
+        """Take a sample and return (disk stats by disk name, top processes by I/O rate)."""
+        now = time.monotonic()
+        elapsed = now - self.last_time if self.last_time is not None else None
+        self.last_time = now
+        return self.sample_disks(elapsed), self.sample_processes(now)
+
+    def sample_disks(self, elapsed):
+        """Update per-disk counters in place and return IOPS, throughput, latency and busy time."""
+        counters = psutil.disk_io_counters(perdisk=True) or {}
+        stats = {}
+        for disk, io in counters.items():
+            # busy_time is only reported on some platforms; fall back to time spent on reads and writes
+            busy_time = getattr(io, "busy_time", io.read_time + io.write_time)
+            current = (io.read_count, io.write_count, io.read_bytes, io.write_bytes,
+                       io.read_time, io.write_time, busy_time)
+            state = self.disk_state.get(disk)
+            if state is None:
+                self.disk_state[disk] = list(current)
+                continue
+            if elapsed:
+                # A counter going backwards means the disk was reset; treat it as a fresh baseline
+                reads, writes, read_bytes, write_bytes, read_time, write_time, busy = (
+                    max(value - previous, 0) for value, previous in zip(current, state)
+                )
+                operations = reads + writes
+                stats[disk] = {
+                    "iops": round(operations / elapsed, 1),
+                    "read_mb_s": round(read_bytes / elapsed / (1024**2), 2),
+                    "write_mb_s": round(write_bytes / elapsed / (1024**2), 2),
+                    "latency_ms": round((read_time + write_time) / operations, 2) if operations else 0.0,
+                    "busy_percent": round(min(busy / (elapsed * 1000) * 100, 100.0), 1),
+                }
+            state[:] = current
+
+        # Forget disks that are no longer present
+        for disk in [disk for disk in self.disk_state if disk not in counters]:
+            del self.disk_state[disk]
+        return stats
+
+    def sample_processes(self, now):
+        """Refresh the next batch of processes and return the top processes by bytes per second."""
+        if not self.process_io_supported:
+            return []
+
+        if self.cursor >= len(self.pids):
+            # Start a new round, forget processes that have exited and rank all cached rates
+            self.pids = psutil.pids()
+            self.cursor = 0
+            running = set(self.pids)
+            for pid in [pid for pid in self.process_state if pid not in running]:
+                del self.process_state[pid]
+            candidates = set(self.process_state)
+        else:
+            # Only refreshed processes have new rates; merge them into the previous ranking
+            candidates = set(self.top_pids)
+
+        end = len(self.pids) if self.batch_size is None else min(self.cursor + self.batch_size, len(self.pids))
+        batch = self.pids[self.cursor:end]
+        self.cursor = end
+
+        # Also refresh the current top processes every time, so the ranking follows processes
+        # that stop or exit mid-round; this adds at most top_count refreshes per sample
+        refresh = set(batch)
+        refresh.update(self.top_pids)
+        for pid in refresh:
+            self.sample_process(pid, now)
+
+        candidates.update(batch)
+        candidates = [pid for pid in candidates if pid in self.process_state]
+        rate = lambda pid: self.process_state[pid][5] + self.process_state[pid][6]
+        self.top_pids = heapq.nlargest(self.top_count, candidates, key=rate)
+        return [
+            {
+                "pid": pid,
+                "name": self.process_state[pid][1],
+                "read_mb_s": round(self.process_state[pid][5] / (1024**2), 2),
+                "write_mb_s": round(self.process_state[pid][6] / (1024**2), 2),
+            }
+            for pid in self.top_pids if rate(pid)
+        ]
+
+    def sample_process(self, pid, now):
+        """Update the cached I/O counters and rates of a single process."""
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                create_time = proc.create_time()
+                io = proc.io_counters()
+                name = proc.name()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            self.process_state.pop(pid, None)
+            return
+
+        state = self.process_state.get(pid)
+        if state is None or state[0] != create_time:
+            # New process, or the PID has been reused by a different one: record a baseline
+            self.process_state[pid] = [create_time, name, io.read_bytes, io.write_bytes, now, 0.0, 0.0]
+            return
+        elapsed = now - state[4]
+        if elapsed > 0 and io.read_bytes >= state[2] and io.write_bytes >= state[3]:
+            state[5] = (io.read_bytes - state[2]) / elapsed
+            state[6] = (io.write_bytes - state[3]) / elapsed
+        state[2] = io.read_bytes
+        state[3] = io.write_bytes
+        state[4] = now
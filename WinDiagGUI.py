@@ -1,5 +1,6 @@
 import sys
 import os
+import time
 import psutil
 import subprocess
 import winreg
@@ -10,6 +11,9 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
 import logging
+from WinDiagDiskIO import DiskIOSampler
+from WinDiagNetwork import NetworkThroughputSampler
+from WinDiagInventory import get_installed_software, fetch_winget_upgrades, merge_winget_updates
 
 # Configure logging
 logging.basicConfig(filename='system_diagnosis.log', level=logging.INFO, 
@@ -17,25 +21,40 @@ logging.basicConfig(filename='system_diagnosis.log', level=logging.INFO,
 
 
 class WingetSoftwareFetchThread(QThread):
-    """Worker thread to fetch installed software and their update status using winget."""
-    software_fetched = pyqtSignal(list)  # Signal to send the fetched software list
+    """Worker thread to fetch available software updates using winget."""
+    updates_fetched = pyqtSignal(object)  # Signal to send (name, installed, available) tuples, or None on failure
 
     def run(self):
-        """Fetch installed software and updates using winget."""
-        software_list = []
-        try:
-            output = subprocess.check_output(
-                ["winget", "list"], universal_newlines=True
-            )
-            for line in output.splitlines():
-                if line.strip() and not line.startswith("Name") and not line.startswith("---"):
-                    parts = line.split()
-                    name = " ".join(parts[:-1])  # Assume the last field is update status
-                    update_available = "Yes" if "Available" in parts[-1] else "No"
-                    software_list.append((name, update_available))
-        except subprocess.CalledProcessError as e:
-            logging.error(f"Failed to fetch software list using winget: {e}")
-        self.software_fetched.emit(software_list)
+        """Fetch upgradable packages using winget."""
+        self.updates_fetched.emit(fetch_winget_upgrades())
+
+
+class NetworkThroughputMonitorThread(QThread):
+    """Worker thread that samples per-interface and per-process network throughput."""
+    rates_updated = pyqtSignal(list, list)  # Signal to send interface rates and process rates
+
+    def __init__(self, interval=1.0, smoothing=0.3, top_count=15, parent=None):
+        super().__init__(parent)
+        self.interval = interval
+        self.sampler = NetworkThroughputSampler(smoothing=smoothing, top_count=top_count)
+
+    def run(self):
+        """Sample network counters on a fixed cadence until interrupted."""
+        last_time = time.monotonic()
+        self.sampler.sample(1.0)
+        while not self.isInterruptionRequested():
+            # Sleep against a fixed schedule so processing time does not skew the cadence,
+            # in short slices so an interruption request is noticed promptly
+            next_time = last_time + self.interval
+            while not self.isInterruptionRequested() and time.monotonic() < next_time:
+                self.msleep(min(50, max(1, int((next_time - time.monotonic()) * 1000))))
+            if self.isInterruptionRequested():
+                break
+            now = time.monotonic()
+            elapsed = max(now - last_time, 1e-3)
+            last_time = now
+            self.sampler.sample(elapsed)
+            self.rates_updated.emit(*self.sampler.snapshot())
 
 
 class SystemDiagnosticApp(QMainWindow):
@@ -90,6 +109,16 @@ class SystemDiagnosticApp(QMainWindow):
         # Temporary file list
         self.temp_files = []
 
+        # Background network throughput samplers, one per open network window
+        self.network_monitor_threads = []
+
+        # winget update fetches; kept referenced until they finish so Qt does not destroy a running thread
+        self.software_fetch_threads = []
+
+        # Disk I/O sampler; rates are computed between timer ticks and only a fixed batch of
+        # processes is refreshed per tick so the GUI thread is not held up by large process lists
+        self.disk_io_sampler = DiskIOSampler(batch_size=100)
+
         # Set up a timer to update live stats
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_live_stats)
@@ -143,6 +172,20 @@ class SystemDiagnosticApp(QMainWindow):
             except PermissionError:
                 continue
         
+        # Disk I/O pressure and top I/O processes since the last update
+        disk_io, top_io_processes = self.disk_io_sampler.sample()
+        disk_io_stats = ""
+        for disk, stats in disk_io.items():
+            disk_io_stats += (
+                f"{disk}: {stats['iops']} IOPS, {stats['read_mb_s']} MB/s read, {stats['write_mb_s']} MB/s write, "
+                f"{stats['latency_ms']} ms latency, {stats['busy_percent']}% busy\n"
+            )
+        for proc in top_io_processes:
+            disk_io_stats += (
+                f"PID: {proc['pid']}, Name: {proc['name']}, "
+                f"Read: {proc['read_mb_s']} MB/s, Write: {proc['write_mb_s']} MB/s\n"
+            )
+
         # Temporary files count
         temp_dirs = [
             os.environ.get('TEMP', ''),
@@ -161,6 +204,7 @@ class SystemDiagnosticApp(QMainWindow):
             f"CPU Usage: {cpu_usage}%\n"
             f"Memory Usage: {memory.percent}% of {round(memory.total / (1024**3), 2)} GB\n"
             f"Disk Usage:\n{disk_stats}"
+            f"Disk I/O:\n{disk_io_stats}"
             f"Temporary Files Count: {temp_files_count}\n"
         )
 
@@ -333,16 +377,17 @@ class SystemDiagnosticApp(QMainWindow):
 
         # Create a table for installed software
         self.software_table = QTableWidget()
-        self.software_table.setColumnCount(3)
-        self.software_table.setHorizontalHeaderLabels(["Select", "Name", "Update Available"])
-        self.software_table = QTableWidget()
-        self.software_table.setColumnCount(3)
-        self.software_table.setHorizontalHeaderLabels(["Select", "Name", "Update Available"])
+        self.software_table.setColumnCount(6)
+        self.software_table.setHorizontalHeaderLabels(
+            ["Select", "Name", "Version", "Publisher", "Size", "Update Available"]
+        )
 
         # Adjust column widths
         self.software_table.setColumnWidth(0, 70)  # Width for the "Select" column
-        self.software_table.setColumnWidth(1, 450)  # Width for the "Name" column
-        self.software_table.setColumnWidth(2, 100)  # Width for the "Update Available" column
+        self.software_table.setColumnWidth(1, 300)  # Width for the "Name" column
+        self.software_table.setColumnWidth(2, 100)  # Width for the "Version" column
+        self.software_table.setColumnWidth(3, 150)  # Width for the "Publisher" column
+        self.software_table.setColumnWidth(4, 80)  # Width for the "Size" column
 
         # Stretch the remaining columns (optional, for better UI)
         self.software_table.horizontalHeader().setStretchLastSection(True)
@@ -360,27 +405,51 @@ class SystemDiagnosticApp(QMainWindow):
         layout.addWidget(update_button)
 
         self.software_window.setLayout(layout)
-        self.software_window.resize(800, 600)
+        self.software_window.resize(900, 600)
         self.software_window.show()
 
-        # Fetch installed software using winget in a separate thread
-        self.software_fetch_thread = WingetSoftwareFetchThread()
-        self.software_fetch_thread.software_fetched.connect(self.populate_software_table)
-        self.software_fetch_thread.start()
+        # List installed software from the registry right away
+        self.installed_software = get_installed_software()
+        self.populate_software_table(self.installed_software)
+
+        # Fetch update availability using winget in a separate thread
+        # An earlier fetch may still be running; let it finish without updating the new table
+        for fetch_thread in self.software_fetch_threads:
+            try:
+                fetch_thread.updates_fetched.disconnect(self.merge_software_updates)
+            except TypeError:
+                pass  # Already disconnected by an earlier refresh
+        fetch_thread = WingetSoftwareFetchThread()
+        fetch_thread.updates_fetched.connect(self.merge_software_updates)
+        fetch_thread.finished.connect(lambda: self.software_fetch_threads.remove(fetch_thread))
+        self.software_fetch_threads.append(fetch_thread)
+        fetch_thread.start()
 
     def populate_software_table(self, software):
-        """Populate the software table with fetched data."""
+        """Populate the software table with installed software."""
         self.software_table.setRowCount(len(software))
-        for row, (name, update_available) in enumerate(software):
+        for row, app in enumerate(software):
             # Add a checkbox in the first column
             checkbox = QTableWidgetItem()
             checkbox.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
             checkbox.setCheckState(Qt.Unchecked)
             self.software_table.setItem(row, 0, checkbox)
 
-            # Add the name and update availability
-            self.software_table.setItem(row, 1, QTableWidgetItem(name))
-            self.software_table.setItem(row, 2, QTableWidgetItem(update_available))
+            # Add the details and update availability
+            size = f"{round(app.install_size / (1024**2), 1)} MB" if app.install_size else ""
+            self.software_table.setItem(row, 1, QTableWidgetItem(app.name))
+            self.software_table.setItem(row, 2, QTableWidgetItem(app.version))
+            self.software_table.setItem(row, 3, QTableWidgetItem(app.publisher))
+            self.software_table.setItem(row, 4, QTableWidgetItem(size))
+            self.software_table.setItem(row, 5, QTableWidgetItem(app.update_available))
+
+    def merge_software_updates(self, upgrades):
+        """Fill in the update column once winget has reported available updates."""
+        if upgrades is None:
+            return  # winget is unavailable; leave update status as unknown
+        self.installed_software = merge_winget_updates(self.installed_software, upgrades)
+        for row, app in enumerate(self.installed_software):
+            self.software_table.setItem(row, 5, QTableWidgetItem(app.update_available))
 
     def uninstall_selected_software(self):
         """Uninstall selected software."""
@@ -392,17 +461,39 @@ class SystemDiagnosticApp(QMainWindow):
             QMessageBox.information(self, "Info", "No software selected for uninstallation.")
             return
 
+        failed = []
         for row in selected_rows:
-            name = self.software_table.item(row, 1).text()
+            app = self.installed_software[row]
             try:
-                subprocess.run(["winget", "uninstall", "--name", name], check=True)
-                logging.info(f"Successfully uninstalled {name}.")
+                subprocess.run(["winget", "uninstall", "--name", app.name], check=True)
+                logging.info(f"Successfully uninstalled {app.name}.")
             except subprocess.CalledProcessError as e:
-                logging.error(f"Failed to uninstall {name}: {e}")
-
-        QMessageBox.information(self, "Success", "Selected software uninstalled successfully.")
+                logging.error(f"Failed to uninstall {app.name}: {e}")
+                failed.append(app.name)
+            except OSError:
+                # winget is not available; fall back to the uninstaller registered for the program
+                if not self.run_uninstall_string(app):
+                    failed.append(app.name)
+
+        if failed:
+            QMessageBox.warning(self, "Uninstall", f"Failed to uninstall: {', '.join(failed)}")
+        else:
+            QMessageBox.information(self, "Success", "Selected software uninstalled successfully.")
         self.manage_software()  # Refresh the list
 
+    def run_uninstall_string(self, app):
+        """Run the uninstall command registered for a program. Returns True on success."""
+        if not app.uninstall_string:
+            logging.error(f"Cannot uninstall {app.name}: winget is unavailable and no uninstall command is registered.")
+            return False
+        try:
+            subprocess.run(app.uninstall_string, check=True)
+            logging.info(f"Successfully uninstalled {app.name} using its uninstaller.")
+            return True
+        except (subprocess.CalledProcessError, OSError) as e:
+            logging.error(f"Failed to uninstall {app.name}: {e}")
+            return False
+
     def update_selected_software(self):
         """Update selected software."""
         selected_rows = [
@@ -413,15 +504,23 @@ class SystemDiagnosticApp(QMainWindow):
             QMessageBox.information(self, "Info", "No software selected for update.")
             return
 
+        failed = []
         for row in selected_rows:
-            name = self.software_table.item(row, 1).text()
+            name = self.installed_software[row].name
             try:
                 subprocess.run(["winget", "upgrade", "--name", name], check=True)
                 logging.info(f"Successfully updated {name}.")
             except subprocess.CalledProcessError as e:
                 logging.error(f"Failed to update {name}: {e}")
-
-        QMessageBox.information(self, "Success", "Selected software updated successfully.")
+                failed.append(name)
+            except OSError as e:
+                logging.error(f"Cannot update {name}: winget is not available ({e})")
+                failed.append(name)
+
+        if failed:
+            QMessageBox.warning(self, "Update", f"Failed to update: {', '.join(failed)}")
+        else:
+            QMessageBox.information(self, "Success", "Selected software updated successfully.")
         self.manage_software()  # Refresh the list
 
     def network_diagnostics(self):
@@ -454,10 +553,89 @@ class SystemDiagnosticApp(QMainWindow):
             self.network_table.setItem(row, 2, QTableWidgetItem(status))
             self.network_table.setItem(row, 3, QTableWidgetItem(pid))
 
+        # Live throughput per interface and per owning process
+        throughput_label = QLabel("Interface Throughput")
+        layout.addWidget(throughput_label)
+
+        self.interface_table = QTableWidget()
+        self.interface_table.setColumnCount(3)
+        self.interface_table.setHorizontalHeaderLabels(["Interface", "Sent", "Received"])
+        self.interface_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        layout.addWidget(self.interface_table)
+
+        process_label = QLabel("Network Processes")
+        layout.addWidget(process_label)
+
+        self.network_process_table = QTableWidget()
+        self.network_process_table.setColumnCount(4)
+        self.network_process_table.setHorizontalHeaderLabels(["PID", "Name", "Connections", "Total Process I/O"])
+        self.network_process_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        layout.addWidget(self.network_process_table)
+
         self.network_window.setLayout(layout)
-        self.network_window.resize(800, 600)
+        self.network_window.resize(800, 800)
         self.network_window.show()
 
+        # Sample throughput in a separate thread and stop it when the window is closed
+        monitor = NetworkThroughputMonitorThread()
+        monitor.rates_updated.connect(self.populate_throughput_tables)
+        self.network_window.setAttribute(Qt.WA_DeleteOnClose)
+        self.network_window.destroyed.connect(lambda: self.stop_network_monitor(monitor))
+        self.network_monitor_threads.append(monitor)
+        monitor.start()
+
+    def stop_network_monitor(self, monitor):
+        """Stop a throughput monitor once its network window has been closed.
+
+        The thread is kept referenced until it has finished so closing the window never
+        blocks the GUI thread waiting for the current sample.
+        """
+        monitor.rates_updated.disconnect(self.populate_throughput_tables)
+        if monitor.isFinished():
+            self.network_monitor_threads.remove(monitor)
+            return
+        monitor.finished.connect(lambda: self.network_monitor_threads.remove(monitor))
+        monitor.requestInterruption()
+
+    def closeEvent(self, event):
+        """Stop background samplers and wait for worker threads before the application exits."""
+        for monitor in list(self.network_monitor_threads):
+            monitor.requestInterruption()
+            monitor.wait()
+        for fetch_thread in list(self.software_fetch_threads):
+            # winget is run with a timeout, but do not hold up exit for it
+            if not fetch_thread.wait(5000):
+                logging.warning("winget update fetch did not finish; stopping it.")
+                fetch_thread.terminate()
+                fetch_thread.wait()
+        super().closeEvent(event)
+
+    def populate_throughput_tables(self, interface_rates, process_rates):
+        """Populate the throughput tables with the latest smoothed rates."""
+        self.interface_table.setRowCount(len(interface_rates))
+        for row, (name, sent, received) in enumerate(interface_rates):
+            self.interface_table.setItem(row, 0, QTableWidgetItem(name))
+            self.interface_table.setItem(row, 1, QTableWidgetItem(self.format_rate(sent)))
+            self.interface_table.setItem(row, 2, QTableWidgetItem(self.format_rate(received)))
+
+        self.network_process_table.setRowCount(len(process_rates))
+        for row, (pid, name, connections, rate) in enumerate(process_rates):
+            self.network_process_table.setItem(row, 0, QTableWidgetItem(str(pid)))
+            self.network_process_table.setItem(row, 1, QTableWidgetItem(name))
+            self.network_process_table.setItem(row, 2, QTableWidgetItem(str(connections)))
+            self.network_process_table.setItem(
+                row, 3, QTableWidgetItem(self.format_rate(rate) if rate is not None else "N/A")
+            )
+
+    @staticmethod
+    def format_rate(bytes_per_second):
+        """Format a byte rate for display."""
+        for unit in ("B/s", "KB/s", "MB/s"):
+            if bytes_per_second < 1024:
+                return f"{bytes_per_second:.1f} {unit}"
+            bytes_per_second /= 1024
+        return f"{bytes_per_second:.1f} GB/s"
+
     def center_child_window(self, window):
         """Center a child window on the screen."""
         screen = QApplication.primaryScreen().geometry()
@@ -0,0 +1,215 @@
+import re
+import bisect
+import logging
+import subprocess
+from collections import namedtuple
+
+# How long to wait for winget before giving up on update information, in seconds
+WINGET_TIMEOUT = 60
+
+# Uninstall keys that list installed software, per hive
+UNINSTALL_KEYS = [
+    ("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+    ("HKLM", r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
+    ("HKCU", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+]
+
+InstalledSoftware = namedtuple(
+    "InstalledSoftware",
+    ["name", "version", "publisher", "install_size", "uninstall_string", "update_available"]
+)
+
+
+class WinregBackend:
+    """Registry backend that reads the live Windows registry through winreg."""
+
+    def __init__(self):
+        import winreg
+        self.winreg = winreg
+        self.hives = {
+            "HKLM": winreg.HKEY_LOCAL_MACHINE,
+            "HKCU": winreg.HKEY_CURRENT_USER,
+        }
+
+    def subkeys(self, hive, path):
+        """Return the names of the subkeys of a key. Raises OSError if the key does not exist."""
+        names = []
+        with self.winreg.OpenKey(self.hives[hive], path) as key:
+            i = 0
+            while True:
+                try:
+                    names.append(self.winreg.EnumKey(key, i))
+                    i += 1
+                except OSError:
+                    break
+        return names
+
+    def values(self, hive, path):
+        """Return the values of a key as a dict. Raises OSError if the key does not exist."""
+        values = {}
+        with self.winreg.OpenKey(self.hives[hive], path) as key:
+            i = 0
+            while True:
+                try:
+                    value_name, value, _ = self.winreg.EnumValue(key, i)
+                    values[value_name] = value
+                    i += 1
+                except OSError:
+                    break
+        return values
+
+
+class InMemoryRegistryBackend:
+    """Registry backend backed by a dict, for use off Windows and in tests.
+
+    `keys` maps (hive, path) to a dict of values, e.g.
+    {("HKLM", r"SOFTWARE\\...\\Uninstall\\App"): {"DisplayName": "App"}}.
+    """
+
+    def __init__(self, keys=None):
+        self.keys = {(hive, path.lower()): values for (hive, path), values in (keys or {}).items()}
+        self.names = {(hive, path.lower()): path.rsplit("\\", 1)[-1] for hive, path in (keys or {})}
+
+    def subkeys(self, hive, path):
+        """Return the names of the direct subkeys of a key."""
+        prefix = path.lower() + "\\"
+        names = [
+            self.names[key] for key in self.keys
+            if key[0] == hive and key[1].startswith(prefix) and "\\" not in key[1][len(prefix):]
+        ]
+        if not names and (hive, path.lower()) not in self.keys:
+            raise FileNotFoundError(f"{hive}\\{path}")
+        return names
+
+    def values(self, hive, path):
+        """Return the values of a key."""
+        try:
+            return dict(self.keys[(hive, path.lower())])
+        except KeyError:
+            raise FileNotFoundError(f"{hive}\\{path}") from None
+
+
+def normalize_name(name):
+    """Normalize a software name for matching registry entries against winget output."""
+    return re.sub(r"[^0-9a-z]+", "", name.lower())
+
+
+def get_installed_software(backend=None):
+    """Enumerate installed software from the registry Uninstall keys."""
+    backend = backend or WinregBackend()
+    software = []
+    seen = set()
+    for hive, path in UNINSTALL_KEYS:
+        try:
+            subkeys = backend.subkeys(hive, path)
+        except OSError:
+            continue
+        for subkey in subkeys:
+            try:
+                values = backend.values(hive, f"{path}\\{subkey}")
+            except OSError as e:
+                logging.warning(f"Could not read {hive}\\{path}\\{subkey}: {e}")
+                continue
+
+            name = str(values.get("DisplayName", "")).strip()
+            # Skip entries without a name, system components and updates to other products
+            if not name or values.get("SystemComponent") == 1 or values.get("ParentKeyName"):
+                continue
+
+            version = str(values.get("DisplayVersion", "")).strip()
+            if (name, version) in seen:
+                continue  # Same product registered under several hives
+            seen.add((name, version))
+
+            size = values.get("EstimatedSize")  # Reported in KB
+            software.append(InstalledSoftware(
+                name=name,
+                version=version,
+                publisher=str(values.get("Publisher", "")).strip(),
+                install_size=size * 1024 if isinstance(size, int) else None,
+                uninstall_string=str(values.get("QuietUninstallString") or values.get("UninstallString") or ""),
+                update_available="Unknown",
+            ))
+    software.sort(key=lambda app: app.name.lower())
+    logging.info(f"Found {len(software)} installed programs in the registry.")
+    return software
+
+
+def parse_winget_table(output):
+    """Parse winget's fixed-width table output into a list of dicts keyed by column header."""
+    lines = output.splitlines()
+    for index, line in enumerate(lines):
+        if line.startswith("Name") and index + 1 < len(lines) and lines[index + 1].startswith("---"):
+            break
+    else:
+        return []
+
+    header = lines[index]
+    columns = [(match.group(), match.start()) for match in re.finditer(r"\S+", header)]
+    rows = []
+    for line in lines[index + 2:]:
+        # The table ends at the first blank line or at the "N upgrades available." footer;
+        # anything after it is other tables or messages
+        if not line.strip() or re.match(r"\d+ \w+ available", line):
+            break
+        row = {}
+        for i, (column, start) in enumerate(columns):
+            end = columns[i + 1][1] if i + 1 < len(columns) else None
+            row[column] = line[start:end].strip()
+        if row.get("Name") and row.get("Id"):
+            rows.append(row)
+    return rows
+
+
+def fetch_winget_upgrades(timeout=WINGET_TIMEOUT):
+    """Return (name, installed version, available version) tuples for packages winget can upgrade.
+
+    Returns None if winget is unavailable, fails or does not finish within `timeout` seconds.
+    """
+    try:
+        output = subprocess.check_output(
+            ["winget", "upgrade", "--accept-source-agreements", "--disable-interactivity"],
+            encoding="utf-8", errors="replace", timeout=timeout
+        )
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError) as e:
+        logging.error(f"Failed to fetch software updates using winget: {e}")
+        return None
+    return [
+        (row["Name"], row.get("Version", ""), row["Available"])
+        for row in parse_winget_table(output) if row.get("Available")
+    ]
+
+
+def merge_winget_updates(software, upgrades):
+    """Return the software list with update availability filled in from winget upgrades.
+
+    Names are matched through a normalized index; winget truncates long names with an
+    ellipsis, so truncated names are matched by prefix. When a name matches several
+    entries, only those whose version equals winget's installed version are marked.
+    """
+    index = {}
+    for row, app in enumerate(software):
+        index.setdefault(normalize_name(app.name), []).append(row)
+    sorted_names = sorted(index)
+
+    available = {}
+    for name, installed_version, version in upgrades:
+        truncated = name.endswith("…") or name.endswith("...")
+        key = normalize_name(name)
+        if not key:
+            continue
+        rows = index.get(key, [])
+        if not rows and truncated:
+            position = bisect.bisect_left(sorted_names, key)
+            while position < len(sorted_names) and sorted_names[position].startswith(key):
+                rows = rows + index[sorted_names[position]]
+                position += 1
+        if len(rows) > 1:
+            rows = [row for row in rows if software[row].version == installed_version]
+        for row in rows:
+            available[row] = version
+
+    return [
+        app._replace(update_available=f"Yes ({available[row]})" if row in available else "No")
+        for row, app in enumerate(software)
+    ]
@@ -0,0 +1,115 @@
+import logging
+import psutil
+
+
+class NetworkThroughputSampler:
+    """Compute smoothed per-interface and per-process network throughput from successive samples.
+
+    Each call to sample() updates the cached state in place; interfaces and processes are seeded
+    without a rate the first time they are seen, so a new entry never shows a spike.
+    """
+
+    # Indexes into the per-interface state lists
+    SENT, RECV, RATE_SENT, RATE_RECV, SEEN = range(5)
+
+    def __init__(self, smoothing=0.3, top_count=15):
+        self.smoothing = smoothing  # Weight of the newest sample in the moving average
+        self.top_count = top_count
+        self.interface_state = {}  # name -> [sent, recv, rate_sent, rate_recv, seen]
+        self.process_state = {}  # pid -> [process, io_bytes, rate, seen]
+        self.connection_counts = {}  # pid -> number of connections
+        self.generation = 0
+
+    def smooth(self, old_rate, new_rate):
+        """Exponentially weighted moving average of a rate."""
+        return old_rate + self.smoothing * (new_rate - old_rate)
+
+    def sample(self, elapsed):
+        """Update interface and process state from counters taken `elapsed` seconds after the last sample."""
+        self.generation += 1
+        self.sample_interfaces(elapsed)
+        self.sample_processes(elapsed)
+
+    def sample_interfaces(self, elapsed):
+        """Update the per-interface state in place from the current NIC counters."""
+        generation = self.generation
+        for name, counters in psutil.net_io_counters(pernic=True).items():
+            state = self.interface_state.get(name)
+            if state is None:
+                # New interface: seed it without a rate so the first delta is not a spike
+                self.interface_state[name] = [counters.bytes_sent, counters.bytes_recv, 0.0, 0.0, generation]
+                continue
+            # psutil already corrects for wraparound, so a counter going backwards means the
+            # interface was reset; keep the new value as a baseline and skip this tick's rate
+            if counters.bytes_sent >= state[self.SENT] and counters.bytes_recv >= state[self.RECV]:
+                sent = (counters.bytes_sent - state[self.SENT]) / elapsed
+                recv = (counters.bytes_recv - state[self.RECV]) / elapsed
+                state[self.RATE_SENT] = self.smooth(state[self.RATE_SENT], sent)
+                state[self.RATE_RECV] = self.smooth(state[self.RATE_RECV], recv)
+            state[self.SENT] = counters.bytes_sent
+            state[self.RECV] = counters.bytes_recv
+            state[self.SEEN] = generation
+
+        # Drop interfaces that have disappeared since the last sample
+        for name in [name for name, state in self.interface_state.items() if state[self.SEEN] != generation]:
+            del self.interface_state[name]
+
+    def sample_processes(self, elapsed):
+        """Count connections per owning process and update their I/O rates where available."""
+        self.connection_counts.clear()
+        try:
+            connections = psutil.net_connections(kind="inet")
+        except psutil.AccessDenied:
+            logging.warning("Access denied while listing network connections.")
+            connections = []
+        for conn in connections:
+            if conn.pid:
+                self.connection_counts[conn.pid] = self.connection_counts.get(conn.pid, 0) + 1
+
+        generation = self.generation
+        for pid in self.connection_counts:
+            state = self.process_state.get(pid)
+            # is_running() compares the create time, so it also catches a reused PID
+            if state is None or not state[0].is_running():
+                try:
+                    state = self.process_state[pid] = [psutil.Process(pid), None, 0.0, generation]
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    self.process_state.pop(pid, None)
+                    continue
+            try:
+                io_bytes = self.process_io_bytes(state[0])
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                io_bytes = None
+            if io_bytes is not None and state[1] is not None and io_bytes >= state[1]:
+                state[2] = self.smooth(state[2], (io_bytes - state[1]) / elapsed)
+            state[1] = io_bytes
+            state[3] = generation
+
+        for pid in [pid for pid, state in self.process_state.items() if state[3] != generation]:
+            del self.process_state[pid]
+
+    @staticmethod
+    def process_io_bytes(process):
+        """Return the total I/O byte count of a process, or None if the OS does not expose it."""
+        if not hasattr(process, "io_counters"):
+            return None
+        counters = process.io_counters()
+        return counters.read_bytes + counters.write_bytes + getattr(counters, "other_bytes", 0)
+
+    def snapshot(self):
+        """Return (interface rates, top process rates) for the current state."""
+        interface_rates = sorted(
+            ((name, state[self.RATE_SENT], state[self.RATE_RECV]) for name, state in self.interface_state.items()),
+            key=lambda row: row[1] + row[2], reverse=True
+        )
+        process_rates = []
+        for pid, count in self.connection_counts.items():
+            state = self.process_state.get(pid)
+            try:
+                name = state[0].name() if state else "N/A"
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                name = "N/A"
+            rate = state[2] if state and state[1] is not None else None
+            process_rates.append((pid, name, count, rate))
+        process_rates.sort(key=lambda row: (row[3] or 0.0, row[2]), reverse=True)
+        return interface_rates, process_rates[:self.top_count]
@@ -0,0 +1,121 @@
+import sys
+import types
+import contextlib
+from collections import namedtuple
+
+import pytest
+
+# The samplers import psutil at module level; let them import where it is not installed.
+# Tests replace the module attribute with FakePsutil below.
+sys.modules.setdefault("psutil", types.ModuleType("psutil"))
+
+NicCounters = namedtuple("NicCounters", "bytes_sent bytes_recv")
+DiskCounters = namedtuple("DiskCounters", "read_count write_count read_bytes write_bytes read_time write_time")
+BusyDiskCounters = namedtuple(
+    "BusyDiskCounters", "read_count write_count read_bytes write_bytes read_time write_time busy_time"
+)
+IOCounters = namedtuple("IOCounters", "read_bytes write_bytes")
+Connection = namedtuple("Connection", "pid")
+
+
+class FakeProcessInfo:
+    """A process as the fake psutil sees it; change the fields between samples."""
+
+    def __init__(self, name, create_time=1.0, read_bytes=0, write_bytes=0):
+        self.name = name
+        self.create_time = create_time
+        self.read_bytes = read_bytes
+        self.write_bytes = write_bytes
+
+
+class FakePsutil:
+    """Minimal stand-in for the parts of psutil the samplers use."""
+
+    class NoSuchProcess(Exception):
+        pass
+
+    class AccessDenied(Exception):
+        pass
+
+    def __init__(self):
+        self.nics = {}  # name -> NicCounters
+        self.disks = {}  # name -> DiskCounters
+        self.processes = {}  # pid -> FakeProcessInfo
+        self.connections = []  # Connection tuples
+        self.io_counter_calls = 0
+        self.process_constructions = 0
+        fake = self
+
+        class Process:
+            def __init__(self, pid):
+                if pid not in fake.processes:
+                    raise fake.NoSuchProcess(pid)
+                fake.process_constructions += 1
+                self.pid = pid
+                self._create_time = fake.processes[pid].create_time
+
+            def _info(self):
+                info = fake.processes.get(self.pid)
+                if info is None or info.create_time != self._create_time:
+                    raise fake.NoSuchProcess(self.pid)
+                return info
+
+            def is_running(self):
+                try:
+                    self._info()
+                    return True
+                except fake.NoSuchProcess:
+                    return False
+
+            def oneshot(self):
+                return contextlib.nullcontext()
+
+            def create_time(self):
+                return self._create_time
+
+            def name(self):
+                return self._info().name
+
+            def io_counters(self):
+                info = self._info()
+                fake.io_counter_calls += 1
+                return IOCounters(info.read_bytes, info.write_bytes)
+
+        self.Process = Process
+
+    def net_io_counters(self, pernic=False):
+        return dict(self.nics)
+
+    def net_connections(self, kind="inet"):
+        return list(self.connections)
+
+    def disk_io_counters(self, perdisk=False):
+        return dict(self.disks)
+
+    def pids(self):
+        return sorted(self.processes)
+
+
+class FakeClock:
+    """Replacement for time.monotonic that only moves when told to."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_psutil(monkeypatch):
+    fake = FakePsutil()
+    for module in ("WinDiagDiskIO", "WinDiagNetwork"):
+        monkeypatch.setattr(f"{module}.psutil", fake)
+    return fake
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr("WinDiagDiskIO.time", types.SimpleNamespace(monotonic=fake_clock))
+    return fake_clock
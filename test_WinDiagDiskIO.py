@@ -0,0 +1,139 @@
+from conftest import BusyDiskCounters, DiskCounters, FakeProcessInfo
+from WinDiagDiskIO import DiskIOSampler
+
+MB = 1024**2
+
+
+def test_first_sample_is_a_baseline(fake_psutil, clock):
+    fake_psutil.disks = {"PhysicalDrive0": DiskCounters(10, 10, MB, MB, 5, 5)}
+    fake_psutil.processes = {4: FakeProcessInfo("app.exe", read_bytes=MB)}
+
+    assert DiskIOSampler().sample() == ({}, [])
+
+
+def test_disk_rates_latency_and_busy_time(fake_psutil, clock):
+    sampler = DiskIOSampler()
+    fake_psutil.disks = {"PhysicalDrive0": DiskCounters(100, 50, 10 * MB, 20 * MB, 1000, 500)}
+    sampler.sample()
+
+    clock.now += 2
+    fake_psutil.disks = {"PhysicalDrive0": DiskCounters(300, 150, 14 * MB, 30 * MB, 1600, 800)}
+    disk_io, _ = sampler.sample()
+
+    assert disk_io == {"PhysicalDrive0": {
+        "iops": 150.0,
+        "read_mb_s": 2.0,
+        "write_mb_s": 5.0,
+        "latency_ms": 3.0,  # 900 ms over 300 operations
+        "busy_percent": 45.0,  # No busy_time: read + write time over the 2 s interval
+    }}
+
+
+def test_busy_time_is_used_when_reported_and_capped(fake_psutil, clock):
+    sampler = DiskIOSampler()
+    fake_psutil.disks = {"sda": BusyDiskCounters(0, 0, 0, 0, 0, 0, 0)}
+    sampler.sample()
+
+    clock.now += 1
+    fake_psutil.disks = {"sda": BusyDiskCounters(10, 0, MB, 0, 5000, 0, 250)}
+    assert sampler.sample()[0]["sda"]["busy_percent"] == 25.0
+
+    clock.now += 1
+    fake_psutil.disks = {"sda": BusyDiskCounters(20, 0, 2 * MB, 0, 10000, 0, 5000)}
+    assert sampler.sample()[0]["sda"]["busy_percent"] == 100.0
+
+
+def test_disk_counter_reset_is_not_a_spike(fake_psutil, clock):
+    sampler = DiskIOSampler()
+    fake_psutil.disks = {"PhysicalDrive0": DiskCounters(10**6, 10**6, 10**12, 10**12, 10**6, 10**6)}
+    sampler.sample()
+
+    clock.now += 1
+    fake_psutil.disks = {"PhysicalDrive0": DiskCounters(10, 0, MB, 0, 20, 0)}
+    stats = sampler.sample()[0]["PhysicalDrive0"]
+    assert stats["iops"] == 0.0
+    assert stats["read_mb_s"] == 0.0
+
+    clock.now += 1
+    fake_psutil.disks = {"PhysicalDrive0": DiskCounters(20, 0, 2 * MB, 0, 40, 0)}
+    assert sampler.sample()[0]["PhysicalDrive0"]["read_mb_s"] == 1.0
+
+
+def test_process_rates_and_reset(fake_psutil, clock):
+    sampler = DiskIOSampler()
+    fake_psutil.processes = {4: FakeProcessInfo("copy.exe", read_bytes=10 * MB, write_bytes=0)}
+    sampler.sample()
+
+    clock.now += 2
+    fake_psutil.processes[4].read_bytes = 14 * MB
+    fake_psutil.processes[4].write_bytes = 2 * MB
+    assert sampler.sample()[1] == [{"pid": 4, "name": "copy.exe", "read_mb_s": 2.0, "write_mb_s": 1.0}]
+
+    # Counters going backwards keep the previous rate instead of producing a spike
+    clock.now += 2
+    fake_psutil.processes[4].read_bytes = 0
+    assert sampler.sample()[1][0]["read_mb_s"] == 2.0
+
+
+def test_reused_pid_gets_a_new_baseline(fake_psutil, clock):
+    sampler = DiskIOSampler()
+    fake_psutil.processes = {4: FakeProcessInfo("old.exe", create_time=1.0, read_bytes=MB)}
+    sampler.sample()
+    clock.now += 1
+    fake_psutil.processes[4].read_bytes = 3 * MB
+    assert sampler.sample()[1][0]["name"] == "old.exe"
+
+    # Same PID, different process: its counters start from a fresh baseline
+    clock.now += 1
+    fake_psutil.processes = {4: FakeProcessInfo("new.exe", create_time=2.0, read_bytes=5 * MB)}
+    assert sampler.sample()[1] == []
+    clock.now += 1
+    fake_psutil.processes[4].read_bytes = 6 * MB
+    assert sampler.sample()[1] == [{"pid": 4, "name": "new.exe", "read_mb_s": 1.0, "write_mb_s": 0.0}]
+
+
+def test_batches_rotate_through_processes(fake_psutil, clock):
+    sampler = DiskIOSampler(top_count=2, batch_size=3)
+    fake_psutil.processes = {pid: FakeProcessInfo(f"p{pid}.exe") for pid in range(1, 9)}
+
+    refreshed = []
+    for _ in range(6):
+        clock.now += 1
+        for info in fake_psutil.processes.values():
+            info.read_bytes += MB
+        fake_psutil.io_counter_calls = 0
+        sampler.sample()
+        refreshed.append(fake_psutil.io_counter_calls)
+
+    # Each sample refreshes one batch plus at most top_count processes from the previous ranking
+    assert max(refreshed) <= 3 + 2
+    # Two full rounds over 8 processes take three samples each
+    assert sampler.cursor == len(fake_psutil.processes)
+    assert all(state[5] == MB for state in sampler.process_state.values())
+
+
+def test_top_processes_are_refreshed_every_sample(fake_psutil, clock):
+    sampler = DiskIOSampler(top_count=1, batch_size=2)
+    fake_psutil.processes = {pid: FakeProcessInfo(f"p{pid}.exe") for pid in range(1, 7)}
+    for _ in range(3):  # First round: baselines
+        sampler.sample()
+    clock.now += 1
+    fake_psutil.processes[1].read_bytes = 8 * MB
+    top = []
+    for _ in range(3):  # Second round: pid 1 gets a rate in the first batch
+        top = sampler.sample()[1]
+    assert [proc["pid"] for proc in top] == [1]
+
+    # pid 1 stops writing while the round-robin has moved past it
+    clock.now += 1
+    top = sampler.sample()[1]
+    assert top == []
+
+    # A top process that exits is dropped straight away
+    fake_psutil.processes[1].read_bytes = 16 * MB
+    clock.now += 1
+    assert [proc["pid"] for proc in sampler.sample()[1]] == [1]
+    del fake_psutil.processes[1]
+    clock.now += 1
+    assert sampler.sample()[1] == []
+    assert 1 not in sampler.process_state
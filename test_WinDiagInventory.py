@@ -0,0 +1,104 @@
+import pytest
+
+from WinDiagInventory import (
+    InMemoryRegistryBackend, get_installed_software, merge_winget_updates, parse_winget_table
+)
+
+HKLM_UNINSTALL = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"
+WOW_UNINSTALL = r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"
+HKCU_UNINSTALL = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"
+
+WINGET_UPGRADE_OUTPUT = """\
+   -\r   \\\r
+Name                                Id                         Version     Available   Source
+---------------------------------------------------------------------------------------------
+Mozilla Firefox (x64 en-US)         Mozilla.Firefox            120.0       121.0       winget
+Microsoft Visual C++ 2015-2022 Red… Microsoft.VCRedist.2015+.x 14.36.32532 14.38.33130 winget
+2 upgrades available.
+
+The following packages have an upgrade available, but require explicit targeting for upgrade:
+Name                                Id                         Version     Available   Source
+---------------------------------------------------------------------------------------------
+Discord                             Discord.Discord            1.0.9015    1.0.9028    winget
+"""
+
+
+@pytest.fixture
+def registry():
+    return InMemoryRegistryBackend({
+        ("HKLM", HKLM_UNINSTALL + r"\{Firefox}"): {
+            "DisplayName": "Mozilla Firefox (x64 en-US)", "DisplayVersion": "120.0",
+            "Publisher": "Mozilla", "EstimatedSize": 2048, "UninstallString": r"C:\firefox\uninstall.exe",
+        },
+        ("HKLM", WOW_UNINSTALL + r"\{VCRedist}"): {
+            "DisplayName": "Microsoft Visual C++ 2015-2022 Redistributable (x86) - 14.36.32532",
+            "DisplayVersion": "14.36.32532", "Publisher": "Microsoft Corporation",
+        },
+        ("HKLM", HKLM_UNINSTALL + r"\{VCRedist64}"): {
+            "DisplayName": "Microsoft Visual C++ 2015-2022 Redistributable (x64) - 14.38.33130",
+            "DisplayVersion": "14.38.33130", "Publisher": "Microsoft Corporation",
+        },
+        # Same product registered under both native and WOW6432Node keys
+        ("HKLM", WOW_UNINSTALL + r"\{Firefox}"): {
+            "DisplayName": "Mozilla Firefox (x64 en-US)", "DisplayVersion": "120.0",
+        },
+        ("HKCU", HKCU_UNINSTALL + r"\Notepad++"): {
+            "DisplayName": "Notepad++", "DisplayVersion": "8.6",
+            "QuietUninstallString": r"C:\npp\uninstall.exe /S", "UninstallString": r"C:\npp\uninstall.exe",
+        },
+        ("HKLM", HKLM_UNINSTALL + r"\{Runtime}"): {"DisplayName": "Hidden Runtime", "SystemComponent": 1},
+        ("HKLM", HKLM_UNINSTALL + r"\KB5001234"): {"DisplayName": "Update for Office", "ParentKeyName": "Office"},
+        ("HKLM", HKLM_UNINSTALL + r"\{NoName}"): {"DisplayVersion": "1.0"},
+    })
+
+
+def test_get_installed_software_reads_all_uninstall_keys(registry):
+    software = get_installed_software(registry)
+
+    assert [app.name for app in software] == [
+        "Microsoft Visual C++ 2015-2022 Redistributable (x64) - 14.38.33130",
+        "Microsoft Visual C++ 2015-2022 Redistributable (x86) - 14.36.32532",
+        "Mozilla Firefox (x64 en-US)",
+        "Notepad++",
+    ]
+    firefox = software[2]
+    assert firefox.version == "120.0"
+    assert firefox.publisher == "Mozilla"
+    assert firefox.install_size == 2048 * 1024
+    assert firefox.uninstall_string == r"C:\firefox\uninstall.exe"
+    assert firefox.update_available == "Unknown"
+    assert software[3].uninstall_string == r"C:\npp\uninstall.exe /S"
+
+
+def test_get_installed_software_without_uninstall_keys():
+    assert get_installed_software(InMemoryRegistryBackend()) == []
+
+
+def test_parse_winget_table_stops_at_end_of_table():
+    rows = parse_winget_table(WINGET_UPGRADE_OUTPUT)
+
+    assert [(row["Name"], row["Available"]) for row in rows] == [
+        ("Mozilla Firefox (x64 en-US)", "121.0"),
+        ("Microsoft Visual C++ 2015-2022 Red…", "14.38.33130"),
+    ]
+
+
+def test_parse_winget_table_without_table():
+    assert parse_winget_table("No installed package found matching input criteria.") == []
+
+
+def test_merge_winget_updates_matches_exact_and_truncated_names(registry):
+    software = get_installed_software(registry)
+    upgrades = [
+        (row["Name"], row["Version"], row["Available"]) for row in parse_winget_table(WINGET_UPGRADE_OUTPUT)
+    ]
+
+    merged = {app.name: app.update_available for app in merge_winget_updates(software, upgrades)}
+
+    # The truncated name matches both Redistributables; only the x86 one is at winget's installed version
+    assert merged == {
+        "Microsoft Visual C++ 2015-2022 Redistributable (x64) - 14.38.33130": "No",
+        "Microsoft Visual C++ 2015-2022 Redistributable (x86) - 14.36.32532": "Yes (14.38.33130)",
+        "Mozilla Firefox (x64 en-US)": "Yes (121.0)",
+        "Notepad++": "No",
+    }
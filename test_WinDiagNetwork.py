@@ -0,0 +1,97 @@
+from conftest import Connection, FakeProcessInfo, NicCounters
+from WinDiagNetwork import NetworkThroughputSampler
+
+
+def test_interface_rates_are_smoothed(fake_psutil):
+    sampler = NetworkThroughputSampler(smoothing=0.5)
+    fake_psutil.nics = {"Ethernet": NicCounters(1000, 5000)}
+    sampler.sample(1.0)
+
+    fake_psutil.nics = {"Ethernet": NicCounters(3000, 9000)}
+    sampler.sample(2.0)
+
+    interface_rates, _ = sampler.snapshot()
+    assert interface_rates == [("Ethernet", 500.0, 1000.0)]
+
+
+def test_interface_counter_reset_becomes_new_baseline(fake_psutil):
+    sampler = NetworkThroughputSampler(smoothing=1.0)
+    fake_psutil.nics = {"Ethernet": NicCounters(10**9, 10**9)}
+    sampler.sample(1.0)
+    fake_psutil.nics = {"Ethernet": NicCounters(10**9 + 100, 10**9 + 200)}
+    sampler.sample(1.0)
+
+    # The adapter was reset: no rate for this tick, and no wraparound spike
+    fake_psutil.nics = {"Ethernet": NicCounters(50, 50)}
+    sampler.sample(1.0)
+    assert sampler.snapshot()[0] == [("Ethernet", 100.0, 200.0)]
+
+    fake_psutil.nics = {"Ethernet": NicCounters(350, 450)}
+    sampler.sample(1.0)
+    assert sampler.snapshot()[0] == [("Ethernet", 300.0, 400.0)]
+
+
+def test_interfaces_appearing_and_disappearing(fake_psutil):
+    sampler = NetworkThroughputSampler(smoothing=1.0)
+    fake_psutil.nics = {"Ethernet": NicCounters(0, 0)}
+    sampler.sample(1.0)
+
+    fake_psutil.nics = {"Ethernet": NicCounters(100, 100), "VPN": NicCounters(10**6, 10**6)}
+    sampler.sample(1.0)
+    # A new interface is seeded without a rate
+    assert sampler.snapshot()[0] == [("Ethernet", 100.0, 100.0), ("VPN", 0.0, 0.0)]
+
+    fake_psutil.nics = {"VPN": NicCounters(10**6 + 10, 10**6 + 10)}
+    sampler.sample(1.0)
+    assert sampler.snapshot()[0] == [("VPN", 10.0, 10.0)]
+    assert list(sampler.interface_state) == ["VPN"]
+
+
+def test_process_connections_and_io_rates(fake_psutil):
+    sampler = NetworkThroughputSampler(smoothing=1.0)
+    fake_psutil.processes = {10: FakeProcessInfo("browser.exe"), 20: FakeProcessInfo("idle.exe")}
+    fake_psutil.connections = [Connection(10), Connection(10), Connection(20), Connection(None)]
+    sampler.sample(1.0)
+
+    fake_psutil.processes[10].read_bytes = 4000
+    sampler.sample(2.0)
+
+    _, process_rates = sampler.snapshot()
+    assert process_rates == [(10, "browser.exe", 2, 2000.0), (20, "idle.exe", 1, 0.0)]
+
+
+def test_cached_processes_are_not_rebuilt(fake_psutil):
+    sampler = NetworkThroughputSampler()
+    fake_psutil.processes = {10: FakeProcessInfo("browser.exe")}
+    fake_psutil.connections = [Connection(10)]
+    for _ in range(5):
+        sampler.sample(1.0)
+
+    assert fake_psutil.process_constructions == 1
+
+
+def test_reused_pid_is_reseeded(fake_psutil):
+    sampler = NetworkThroughputSampler(smoothing=1.0)
+    fake_psutil.processes = {10: FakeProcessInfo("old.exe", create_time=1.0, read_bytes=10**9)}
+    fake_psutil.connections = [Connection(10)]
+    sampler.sample(1.0)
+
+    # The PID now belongs to a new process with much smaller counters
+    fake_psutil.processes = {10: FakeProcessInfo("new.exe", create_time=2.0, read_bytes=100)}
+    sampler.sample(1.0)
+    assert sampler.snapshot()[1] == [(10, "new.exe", 1, 0.0)]
+
+    fake_psutil.processes[10].read_bytes = 600
+    sampler.sample(1.0)
+    assert sampler.snapshot()[1] == [(10, "new.exe", 1, 500.0)]
+
+
+def test_exited_processes_are_forgotten(fake_psutil):
+    sampler = NetworkThroughputSampler()
+    fake_psutil.processes = {10: FakeProcessInfo("browser.exe")}
+    fake_psutil.connections = [Connection(10)]
+    sampler.sample(1.0)
+
+    fake_psutil.processes = {}
+    sampler.sample(1.0)
+    assert sampler.process_state == {}